@@ -3,9 +3,47 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
+from collections import OrderedDict
 from typing import Dict, Optional, Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Maximum number of spool lookups kept in the LRU cache
+CACHE_MAX_SIZE = 16
+
+# Quiet period before applying a spool change, so rapid-fire events
+# (UI clicks, reconnect storms) collapse into a single update
+DEBOUNCE_DELAY = 0.1
+
+# Marker for "no spool change pending"; None is a valid pending value
+# (it means the active spool was cleared)
+_NO_PENDING = object()
+
+# Marker for "Klipper's variable state is unknown"; compares unequal to
+# every payload so the next push always goes through
+_UNPUSHED = object()
+
+# Ask Spoolman for just the fields we push to Klipper rather than the
+# full spool record (usage stats, timestamps, extra metadata)
+_SPOOL_FIELDS_QUERY = "?fields=" + ",".join((
+    "filament.id",
+    "filament.settings_extruder_temp",
+    "filament.settings_bed_temp",
+    "filament.material",
+    "filament.name",
+    "filament.vendor.name",
+))
+
+# Translation table and pattern used to escape values for gcode
+_WHITESPACE_TABLE = str.maketrans({"\n": " ", "\r": " "})
+_ESCAPE_PATTERN = re.compile(r'([\\"])')
+
 
 class SpoolmanExt:
     def __init__(self, config):
@@ -20,10 +58,55 @@ class SpoolmanExt:
         # Public state
         self.current_spool: Optional[Dict[str, Any]] = None
 
+        # Payload last successfully pushed to Klipper; unlike
+        # current_spool this only changes when a push completes, so it
+        # is safe to dedupe against
+        self._pushed_spool: Any = _UNPUSHED
+
+        # Ask both Moonraker and Spoolman to hold the connection open so
+        # repeat spool changes skip the TCP (and TLS) handshake, and for
+        # compressed bodies to cut bytes on the wire.
+        self._request_headers = {
+            "Connection": "keep-alive",
+            "Accept-Encoding": "gzip",
+        }
+
+        # Whether this Spoolman build accepts field selection; detected
+        # lazily on the first spool fetch
+        self._fields_supported: Optional[bool] = None
+
+        # Debounce state for active_spool_set events
+        self._pending_id: Any = _NO_PENDING
+        self._debounce_task: Optional[asyncio.Task] = None
+
+        # Currently running fetch+update, cancelled when superseded
+        self._inflight: Optional[asyncio.Task] = None
+
         # Internal state
         self._macro_checked = False
         self._macro_available = False
 
+        # LRU cache of extracted spool data, keyed by spool ID, so
+        # re-selecting a recent spool skips the HTTP fetch and JSON parse
+        self._spool_cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+
+        # Variables exposed on the SPOOLMAN_VARS macro, with their
+        # constant command prefixes built once instead of per update
+        self._variables = (
+            "id", "hotend_temp", "bed_temp", "material", "name", "vendor"
+        )
+        self._var_prefixes = tuple(
+            "SET_GCODE_VARIABLE "
+            "MACRO=SPOOLMAN_VARS "
+            f"VARIABLE={var} VALUE="
+            for var in self._variables
+        )
+
+        # The clear payload never varies, so serialize it once
+        self._clear_script = "\n".join(
+            prefix + '"None"' for prefix in self._var_prefixes
+        )
+
         # Read and normalize Spoolman server URL
         spoolman_config = config.getsection("spoolman")
         self.spoolman_url = spoolman_config.get("server").rstrip("/")
@@ -47,35 +130,49 @@ class SpoolmanExt:
     async def _on_klippy_ready(self) -> None:
         """Triggered when Klipper becomes ready."""
         self.log.info("Klippy ready, searching for gcode_macro SPOOLMAN_VARS")
-        if not await self._ensure_macro_available():
+
+        # A restart resets SPOOLMAN_VARS to its config defaults while
+        # this component's state persists; forget what was pushed so the
+        # initial load is never deduped away
+        self._pushed_spool = _UNPUSHED
+
+        # The macro query (Klippy round-trip) and the active-spool fetch
+        # (Moonraker HTTP round-trip) are independent, so overlap them;
+        # only the final Klipper update needs both results
+        macro_ok, spool_id = await asyncio.gather(
+            self._ensure_macro_available(),
+            self._fetch_initial_spool_id(),
+            return_exceptions=True,
+        )
+        if macro_ok is not True:
             return
+        if isinstance(spool_id, BaseException):
+            self.log.warning(
+                "Initial spool load failed (%s). Spoolman may not be ready yet.",
+                spool_id,
+            )
+            return
+
         self.log.info("Performing initial spool load...")
-        await self._load_initial_spool()
+        if spool_id is not None:
+            await self._update_spool_info(spool_id)
+        else:
+            self.log.info("No active spool on initial load")
+            await self._update_klipper(None)
 
-    async def _load_initial_spool(self) -> None:
-        """Fetch the current active spool from Moonraker's Spoolman status."""
+    async def _fetch_initial_spool_id(self) -> Optional[int]:
+        """Fetch the active spool ID from Moonraker's Spoolman status."""
         url = f"{self.moonraker_url}/server/spoolman/spool_id"
 
-        try:
-            response = await self.http_client.get(url)
-            if response.has_error():
-                raise RuntimeError(f"HTTP error {response.status_code}")
-
-            data = response.json()
-            self.log.debug("Initial Spoolman status response: %s", data)
-
-            spool_id = data.get("result", {}).get("spool_id")
-            if spool_id is not None:
-                await self._update_spool_info(spool_id)
-            else:
-                self.log.info("No active spool on initial load")
-                await self._update_klipper(None)
+        response = await self.http_client.get(
+            url, headers=self._request_headers
+        )
+        if response.has_error():
+            raise RuntimeError(f"HTTP error {response.status_code}")
 
-        except Exception as exc:
-            self.log.warning(
-                "Initial spool load failed (%s). Spoolman may not be ready yet.",
-                exc,
-            )
+        data = self._decode_json(response)
+        self.log.debug("Initial Spoolman status response: %s", data)
+        return data.get("result", {}).get("spool_id")
 
     async def _on_active_spool_set(self, event: Dict[str, Any]) -> None:
         """
@@ -86,51 +183,137 @@ class SpoolmanExt:
         """
         if not self._macro_available:
             return
-        
-        spool_id = event.get("spool_id")
 
+        # Remember only the newest spool ID; a single debounce task
+        # applies it after a short quiet period so event bursts collapse
+        # into one fetch+update
+        self._pending_id = event.get("spool_id")
+        if self._inflight is not None and not self._inflight.done():
+            # Abandon the superseded fetch rather than pushing stale
+            # data to Klipper first
+            self._inflight.cancel()
+        if self._debounce_task is None or self._debounce_task.done():
+            eventloop = self.server.get_event_loop()
+            self._debounce_task = eventloop.create_task(
+                self._apply_pending_spool()
+            )
+
+    async def _apply_pending_spool(self) -> None:
+        """Apply the most recent pending spool change after a quiet period."""
+        eventloop = self.server.get_event_loop()
+        while self._pending_id is not _NO_PENDING:
+            await asyncio.sleep(DEBOUNCE_DELAY)
+
+            spool_id = self._pending_id
+            self._pending_id = _NO_PENDING
+
+            # Run the apply as its own task so a newer event can cancel
+            # it mid-fetch; the loop then picks up the new pending ID
+            self._inflight = eventloop.create_task(
+                self._apply_spool(spool_id)
+            )
+            try:
+                await self._inflight
+            except asyncio.CancelledError:
+                self.log.debug("Spool update superseded, dropping it")
+            finally:
+                self._inflight = None
+
+    async def _apply_spool(self, spool_id: Optional[int]) -> None:
+        """Push the given spool to Klipper, or clear it when None."""
         if spool_id is None:
+            if self._pushed_spool is None:
+                self.log.debug("Active spool already cleared, nothing to do")
+                return
             self.log.info("Active spool cleared, resetting Klipper variables")
-            self.current_spool = None
-            await self._update_klipper(None)
+            if await self._update_klipper(None):
+                self.current_spool = None
             return
 
         await self._update_spool_info(spool_id)
 
     async def _update_spool_info(self, spool_id: int) -> None:
         """Fetch filament data for the given spool ID."""
-        url = f"{self.spoolman_url}/api/v1/spool/{spool_id}"
+        cached = self._spool_cache.get(spool_id)
+        if cached is not None:
+            self._spool_cache.move_to_end(spool_id)
+            if cached == self._pushed_spool:
+                self.log.debug("Spool %s already active, nothing to do", spool_id)
+                return
+            self.log.info("Using cached spool info (ID=%s)", spool_id)
+            if await self._update_klipper(cached):
+                self.current_spool = cached
+            return
+
+        base_url = f"{self.spoolman_url}/api/v1/spool/{spool_id}"
         self.log.info("Fetching spool info (ID=%s)", spool_id)
 
         try:
-            response = await self.http_client.get(url)
+            url = base_url
+            if self._fields_supported is not False:
+                url += _SPOOL_FIELDS_QUERY
+
+            response = await self.http_client.get(
+                url, headers=self._request_headers
+            )
+            if (
+                response.has_error()
+                and self._fields_supported is None
+                and response.status_code in (400, 422)
+            ):
+                # This Spoolman build rejects field selection; remember
+                # that and fall back to the full record from now on.
+                # Other errors (missing spool, server starting up) say
+                # nothing about field support, so leave detection open.
+                self._fields_supported = False
+                self.log.info(
+                    "Spoolman rejected field selection, "
+                    "fetching full spool records"
+                )
+                response = await self.http_client.get(
+                    base_url, headers=self._request_headers
+                )
             if response.has_error():
                 raise RuntimeError(f"HTTP error {response.status_code}")
+            if self._fields_supported is None:
+                self._fields_supported = True
 
-            spool = response.json()
+            spool = self._decode_json(response)
             filament = spool.get("filament")
 
             if not filament:
                 self.log.warning("No filament data found for spool ID %s", spool_id)
-                self.current_spool = None
-                await self._update_klipper(None)
+                if await self._update_klipper(None):
+                    self.current_spool = None
                 return
 
+            filament_get = filament.get
+            vendor = filament_get("vendor")
             extracted = {
-                "id": filament.get("id"),
-                "hotend_temp": filament.get("settings_extruder_temp"),
-                "bed_temp": filament.get("settings_bed_temp"),
-                "material": filament.get("material"),
-                "name": filament.get("name"),
+                "id": filament_get("id"),
+                "hotend_temp": filament_get("settings_extruder_temp"),
+                "bed_temp": filament_get("settings_bed_temp"),
+                "material": filament_get("material"),
+                "name": filament_get("name"),
                 "vendor": (
-                    filament.get("vendor", {}).get("name")
-                    if isinstance(filament.get("vendor"), dict)
-                    else None
+                    vendor.get("name") if isinstance(vendor, dict) else None
                 ),
             }
 
-            self.current_spool = extracted
-            await self._update_klipper(extracted)
+            # Release the full response payload before the awaited
+            # Klipper update so it is collectable during the round-trip
+            del response, spool, filament, filament_get, vendor
+
+            self._spool_cache[spool_id] = extracted
+            if len(self._spool_cache) > CACHE_MAX_SIZE:
+                self._spool_cache.popitem(last=False)
+
+            if extracted == self._pushed_spool:
+                self.log.debug("Spool %s data unchanged, nothing to do", spool_id)
+                return
+
+            if await self._update_klipper(extracted):
+                self.current_spool = extracted
 
         except Exception as exc:
             self.server.add_warning(
@@ -145,76 +328,80 @@ class SpoolmanExt:
 
     async def _update_klipper(
         self, spool_data: Optional[Dict[str, Any]]
-    ) -> None:
-        """Push spool data into Klipper via SET_GCODE_VARIABLE."""
+    ) -> bool:
+        """Push spool data into Klipper via SET_GCODE_VARIABLE.
 
-        variables = ("id", "hotend_temp", "bed_temp", "material", "name", "vendor")
+        Returns True when the push completed, so callers only record
+        state that actually reached Klipper.
+        """
 
         try:
             if spool_data is None:
-                for var in variables:
-                    gcode = (
-                        "SET_GCODE_VARIABLE "
-                        "MACRO=SPOOLMAN_VARS "
-                        f'VARIABLE={var} VALUE="None"'
-                    )
-                    await self.klippy_apis.run_gcode(gcode)
-
+                await self.klippy_apis.run_gcode(self._clear_script)
+                self._pushed_spool = None
                 self.log.info("SPOOLMAN_VARS cleared")
-                return
-
-            for var in variables:
-                value = spool_data.get(var)
-                value_str = self._escape_gcode_value(value)
+                return True
 
-                gcode = (
-                    "SET_GCODE_VARIABLE "
-                    "MACRO=SPOOLMAN_VARS "
-                    f'VARIABLE={var} VALUE=\'"{value_str}"\''
-                )
-                await self.klippy_apis.run_gcode(gcode)
+            script = "\n".join(
+                prefix
+                + f'\'"{self._escape_gcode_value(spool_data.get(var))}"\''
+                for var, prefix in zip(self._variables, self._var_prefixes)
+            )
+            await self.klippy_apis.run_gcode(script)
 
+            self._pushed_spool = spool_data
             self.log.info("SPOOLMAN_VARS updated")
+            return True
 
         except Exception as exc:
             self.log.warning(
                 "Failed to update SPOOLMAN_VARS: %s",
                 exc,
             )
+            return False
 
     async def _ensure_macro_available(self) -> bool:
-        """Check once whether the SPOOLMAN_VARS macro exists by probing it."""
+        """Check once whether the SPOOLMAN_VARS macro exists.
+
+        Uses a read-only object query rather than executing a probe
+        gcode, so startup never mutates macro state.
+        """
         if self._macro_checked:
             return self._macro_available
 
         self._macro_checked = True
+        macro_object = "gcode_macro SPOOLMAN_VARS"
 
         try:
-            # Probe macro existence with a harmless dummy variable
-            gcode = (
-                "SET_GCODE_VARIABLE "
-                "MACRO=SPOOLMAN_VARS "
-                'VARIABLE=id VALUE="None"'
-            )
-            await self.klippy_apis.run_gcode(gcode)
+            result = await self.klippy_apis.query_objects({macro_object: None})
+            # Klippy silently omits unknown objects from the query result
+            status = result.get("status", result)
+            self._macro_available = macro_object in status
+
+        except Exception as exc:
+            self._macro_available = False
+            self.log.warning(f"Failed sanity check for SPOOLMAN_VARS: {exc}")
 
-            self._macro_available = True
+        if self._macro_available:
             self.log.info("gcode_macro SPOOLMAN_VARS detected")
-            return True
+        else:
+            self.server.add_warning(
+                f"{self.component_name}: gcode_macro SPOOLMAN_VARS not found. "
+                "Spool details will not be pulled from Spoolman."
+            )
 
-        except Exception as exc:
-            if "'id'" in str(exc).lower():
-                self._macro_available = True
-                self.log.info("gcode_macro SPOOLMAN_VARS detected, but missing valid variable/s")
-                return True
-            else:
-                self._macro_available = False
-                self.server.add_warning(
-                    f"{self.component_name}: gcode_macro SPOOLMAN_VARS not found. "
-                    "Spool details will not be pulled from Spoolman."
-                )
-                self.log.warning(f"Failed sanity check for SPOOLMAN_VARS: {exc}")
-                return False
+        return self._macro_available
+
+    @staticmethod
+    def _decode_json(response: Any) -> Any:
+        """Decode a response body, using orjson when it is installed.
+
+        orjson parses the raw bytes directly, skipping the intermediate
+        UTF-8 str that response.json() builds before stdlib json.loads.
+        """
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
 
     @staticmethod
     def _escape_gcode_value(value: Any) -> str:
@@ -222,11 +409,8 @@ class SpoolmanExt:
         if value is None:
             return "None"
 
-        text = str(value)
-        text = text.replace("\\", "\\\\")
-        text = text.replace('"', '\\"')
-        text = text.replace("\n", " ").replace("\r", " ")
-        return text
+        text = str(value).translate(_WHITESPACE_TABLE)
+        return _ESCAPE_PATTERN.sub(r"\\\1", text)
 
 
 def load_component(config):